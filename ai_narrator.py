@@ -1,23 +1,40 @@
 import json
 import random
 from dataclasses import dataclass
-from typing import Optional
+from typing import Optional, Sequence
 
 import aiohttp
 
+from events import CATACLYSM_TOPICS as DEFAULT_CATASTLYSM_TOPICS
 
-DEFAULT_CATASTLYSM_TOPICS = [
-    "глобальна біоепідемія зі зривом систем охорони здоровʼя",
-    "обмежений ядерний обмін із подальшою ядерною зимою",
-    "каскадні відмови енергосистем і тривала техногенна криза",
-    "різка зміна клімату з колапсом аграрного виробництва",
-    "масштабна хімічна аварія з отруєнням води та ґрунтів",
-]
 
+# Shared HTTP session (keeps TLS connections to the Gemini API alive between calls)
+_SESSION: Optional[aiohttp.ClientSession] = None
 
-def pick_default_cataclysm_topic(rng: Optional[random.Random] = None) -> str:
+# Requested model name -> model resolved via models:list
+_RESOLVED_MODELS: dict[str, str] = {}
+
+
+def _get_session() -> aiohttp.ClientSession:
+    global _SESSION
+    if _SESSION is None or _SESSION.closed:
+        _SESSION = aiohttp.ClientSession()
+    return _SESSION
+
+
+async def close_session() -> None:
+    global _SESSION
+    if _SESSION is not None and not _SESSION.closed:
+        await _SESSION.close()
+    _SESSION = None
+
+
+def pick_default_cataclysm_topic(
+    rng: Optional[random.Random] = None,
+    topics: Optional[Sequence[str]] = None,
+) -> str:
     rng = rng or random
-    return rng.choice(DEFAULT_CATASTLYSM_TOPICS)
+    return rng.choice(topics or DEFAULT_CATASTLYSM_TOPICS)
 
 
 def _normalize_model(model: str) -> str:
@@ -65,11 +82,11 @@ async def list_gemini_models(*, api_key: str, timeout_s: float = 20.0) -> list[G
     params = {"key": api_key}
 
     timeout = aiohttp.ClientTimeout(total=timeout_s)
-    async with aiohttp.ClientSession(timeout=timeout) as session:
-        async with session.get(url, params=params) as resp:
-            text = await resp.text()
-            if resp.status >= 400:
-                raise RuntimeError(f"Gemini models:list error {resp.status}: {text}")
+    session = _get_session()
+    async with session.get(url, params=params, timeout=timeout) as resp:
+        text = await resp.text()
+        if resp.status >= 400:
+            raise RuntimeError(f"Gemini models:list error {resp.status}: {text}")
 
     data = json.loads(text)
     models = []
@@ -113,6 +130,23 @@ def pick_best_model(available: list[GeminiModel], preferred: Optional[str]) -> s
     return available_generate[0].name
 
 
+async def resolve_model(*, api_key: str, model: str, refresh: bool = False) -> str:
+    if not refresh:
+        cached = _RESOLVED_MODELS.get(model)
+        if cached:
+            return cached
+    available = await list_gemini_models(api_key=api_key)
+    picked = pick_best_model(available, preferred=model)
+    _RESOLVED_MODELS[model] = picked
+    return picked
+
+
+async def warm_up(*, api_key: str, model: str) -> str:
+    # models:list resolves the model and leaves a keep-alive connection in the session pool,
+    # so the first /newgame skips both the discovery request and the TLS handshake.
+    return await resolve_model(api_key=api_key, model=model, refresh=True)
+
+
 def build_cataclysm_prompt(cataclysm_type: str) -> str:
     return (
         "META-PROMPT ДЛЯ GEMINI\n"
@@ -165,39 +199,38 @@ async def generate_cataclysm_story(
         payload = {"contents": [{"parts": [{"text": prompt}]}]}
 
         timeout = aiohttp.ClientTimeout(total=timeout_s)
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            async with session.post(url, params=params, json=payload) as resp:
-                text = await resp.text()
-                if resp.status == 429:
-                    try:
-                        parsed = json.loads(text)
-                    except Exception:
-                        parsed = {}
-                    retry_after = _parse_retry_after_seconds(parsed) if parsed else None
-                    message = (
-                        (parsed.get("error") or {}).get("message")
-                        if isinstance(parsed, dict)
-                        else None
-                    )
-                    raise GeminiQuotaError(
-                        status_code=429,
-                        message=message or "RESOURCE_EXHAUSTED",
-                        retry_after_s=retry_after,
-                        raw=text,
-                    )
-                if resp.status >= 400:
-                    raise RuntimeError(f"Gemini API error {resp.status}: {text}")
+        session = _get_session()
+        async with session.post(url, params=params, json=payload, timeout=timeout) as resp:
+            text = await resp.text()
+            if resp.status == 429:
+                try:
+                    parsed = json.loads(text)
+                except Exception:
+                    parsed = {}
+                retry_after = _parse_retry_after_seconds(parsed) if parsed else None
+                message = (
+                    (parsed.get("error") or {}).get("message")
+                    if isinstance(parsed, dict)
+                    else None
+                )
+                raise GeminiQuotaError(
+                    status_code=429,
+                    message=message or "RESOURCE_EXHAUSTED",
+                    retry_after_s=retry_after,
+                    raw=text,
+                )
+            if resp.status >= 400:
+                raise RuntimeError(f"Gemini API error {resp.status}: {text}")
         return text
 
-    requested_model = _normalize_model(model)
+    requested_model = _RESOLVED_MODELS.get(model) or _normalize_model(model)
     try:
         raw = await _call_generate(model_name=requested_model)
     except RuntimeError as err:
         # If model is not found/available for this key, auto-pick a valid one.
         msg = str(err)
         if " 404" in msg or "NOT_FOUND" in msg or "is not found" in msg:
-            available = await list_gemini_models(api_key=api_key)
-            picked = pick_best_model(available, preferred=model)
+            picked = await resolve_model(api_key=api_key, model=model, refresh=True)
             raw = await _call_generate(model_name=picked)
         else:
             raise
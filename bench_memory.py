@@ -0,0 +1,175 @@
+"""Memory footprint of per-game state, with a regression gate.
+
+    python bench_memory.py                     # compare with bench_memory_baseline.json
+    python bench_memory.py --update-baseline   # accept the current numbers
+
+Synthetic games are built in the bot's own registries (GAMES, USER_GAMES,
+_LAST_AI_CALL_AT) through the real Game.join/vote APIs. Retained memory of each
+step is the tracemalloc difference between snapshots taken after gc.
+"""
+
+import argparse
+import gc
+import importlib
+import json
+import os
+import sys
+import tracemalloc
+from typing import Callable, Optional
+
+# config.py refuses to load without a token; the bench never talks to Telegram
+os.environ.setdefault("BOT_TOKEN", "0:bench")
+
+import bot  # noqa: E402
+import content  # noqa: E402
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_memory_baseline.json")
+
+# Metrics compared with the baseline: narrator/pack caches (bytes) and per-unit costs
+GATED_METRICS = ("narrator_and_pack", "per_game", "per_player", "per_vote", "per_ai_cooldown")
+
+# A run is only compared with a baseline of the same shape
+SHAPE_KEYS = ("games", "players", "pack")
+
+
+def _retained(step: Callable[[], None]) -> int:
+    gc.collect()
+    before = tracemalloc.take_snapshot()
+    step()
+    gc.collect()
+    after = tracemalloc.take_snapshot()
+    return sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+
+
+def measure(games: int, players: int, pack: Optional[str] = None) -> dict:
+    chat_ids = [-1_000_000 - i for i in range(games)]
+    votes_cast = 0
+
+    def load_narrator() -> None:
+        narrator = importlib.import_module("ai_narrator")
+        narrator._RESOLVED_MODELS["gemini-1.5-flash-latest"] = "models/gemini-1.5-flash-latest"
+        content.configure(pack)
+
+    def create_games() -> None:
+        for i, chat_id in enumerate(chat_ids):
+            game = bot.get_game(chat_id)
+            game.new_game(requested_by=1, seed=i)
+            game.title = f"Bench chat {i}"
+
+    def join_players() -> None:
+        for chat_id in chat_ids:
+            game = bot.GAMES[chat_id]
+            for uid in range(1, players + 1):
+                player = game.join(uid, f"user{uid}")
+                bot._index_user(player.user_id, chat_id)
+            game.start_game(requested_by=1)
+            game.start_round(requested_by=1)
+
+    def cast_votes() -> None:
+        nonlocal votes_cast
+        for chat_id in chat_ids:
+            game = bot.GAMES[chat_id]
+            for uid in range(1, players + 1):
+                target = uid % players + 1
+                if game.vote(uid, f"@user{target}"):
+                    votes_cast += 1
+
+    def mark_ai_calls() -> None:
+        for i, chat_id in enumerate(chat_ids):
+            bot._LAST_AI_CALL_AT[chat_id] = 1000.0 + i
+
+    tracemalloc.start()
+    try:
+        narrator_bytes = _retained(load_narrator)
+        games_bytes = _retained(create_games)
+        players_bytes = _retained(join_players)
+        votes_bytes = _retained(cast_votes)
+        ai_bytes = _retained(mark_ai_calls)
+    finally:
+        tracemalloc.stop()
+        for chat_id in chat_ids:
+            bot._drop_game(chat_id)
+            bot._LAST_AI_CALL_AT.pop(chat_id, None)
+
+    total = games_bytes + players_bytes + votes_bytes + ai_bytes
+    return {
+        "games": games,
+        "players": players,
+        "pack": content.current_pack().version,
+        "narrator_and_pack": narrator_bytes,
+        "per_game": games_bytes / games,
+        "per_player": players_bytes / (games * players),
+        "per_vote": votes_bytes / max(votes_cast, 1),
+        "per_ai_cooldown": ai_bytes / games,
+        "per_game_total": total / games,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    failures = []
+    for key in GATED_METRICS:
+        old = baseline.get(key)
+        if old is None or old <= 0:
+            continue
+        if current[key] > old * (1 + threshold):
+            failures.append(f"{key}: {current[key]:.0f} B vs baseline {old:.0f} B (+{current[key] / old - 1:.0%})")
+    return failures
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure retained memory of per-game state")
+    parser.add_argument("--games", type=int, default=None, help="default: the baseline's, else 2000")
+    parser.add_argument("--players", type=int, default=None, help="default: the baseline's, else 8")
+    parser.add_argument("--pack", default=None, help="JSON content pack (default: built-in)")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed growth over baseline (0.10 = 10%%)")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    baseline: Optional[dict] = None
+    if not args.update_baseline:
+        if not os.path.exists(args.baseline):
+            print(f"No baseline at {args.baseline}; run with --update-baseline first")
+            return 2
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    games = args.games or (baseline or {}).get("games", 2000)
+    players = args.players or (baseline or {}).get("players", 8)
+    if games < 1 or players < 2:
+        parser.error("need at least 1 game and 2 players")
+
+    current = measure(games, players, args.pack)
+    print(f"{games} games x {players} players, pack {current['pack']} (Python {sys.version.split()[0]})")
+    for key in GATED_METRICS + ("per_game_total",):
+        print(f"  {key:<23} {current[key]:>10.1f} B")
+
+    if baseline is None:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({**current, "python": sys.version.split()[0]}, f, indent=2)
+            f.write("\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    # Per-unit costs depend on container growth steps, so only the same shape is comparable
+    shape = {key: current[key] for key in SHAPE_KEYS}
+    baseline_shape = {key: baseline.get(key) for key in SHAPE_KEYS}
+    if shape != baseline_shape:
+        print(f"Baseline shape {baseline_shape} differs from this run {shape}; not comparing")
+        return 2
+
+    if baseline.get("python", "").rsplit(".", 1)[0] != sys.version.split()[0].rsplit(".", 1)[0]:
+        print(f"Warning: baseline was taken on Python {baseline.get('python')}; object sizes may differ")
+
+    failures = compare(current, baseline, args.threshold)
+    if failures:
+        print(f"Memory footprint regressed beyond {args.threshold:.0%}:")
+        for line in failures:
+            print(f"  {line}")
+        return 1
+    print(f"Within {args.threshold:.0%} of baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,7 +1,14 @@
+import time
+
+_PROCESS_T0 = time.perf_counter()
+
 import asyncio
+import importlib
 import logging
+from datetime import datetime, timezone
 from html import escape
-from typing import Dict
+from types import ModuleType
+from typing import Dict, List, Optional, Set, Tuple
 
 from aiogram import Bot, Dispatcher
 from aiogram.client.default import DefaultBotProperties
@@ -10,11 +17,19 @@ from aiogram.exceptions import TelegramForbiddenError
 from aiogram.filters import Command
 from aiogram.types import Message
 
-from characters import format_character, generate_character
-from config import BOT_TOKEN, GEMINI_API_KEY, GEMINI_MODEL, NARRATOR
-from ai_narrator import GeminiQuotaError, generate_cataclysm_story, pick_default_cataclysm_topic
+import content
+from characters import format_character
+from config import (
+    BOT_TOKEN,
+    CONTENT_PACK,
+    EVENT_AUTO_ELIMINATE,
+    GEMINI_API_KEY,
+    GEMINI_MODEL,
+    NARRATOR,
+    UNIQUE_PROFESSIONS,
+)
 from events import random_event
-from game import Game
+from game import Game, Player
 
 logging.basicConfig(level=logging.INFO)
 
@@ -24,10 +39,35 @@ dp = Dispatcher()
 # games[chat_id] = Game
 GAMES: Dict[int, Game] = {}
 
+# user_id -> chat_ids of games where the user is still in play (kept in sync with GAMES)
+USER_GAMES: Dict[int, Set[int]] = {}
+
 # Simple anti-spam for expensive AI calls (per chat)
 _LAST_AI_CALL_AT: Dict[int, float] = {}
 _AI_COOLDOWN_S: float = 30.0
 
+# ai_narrator is imported lazily and only when GEMINI_API_KEY is set
+_NARRATOR_MODULE: Optional[ModuleType] = None
+
+# Startup timings, ms (reported when warm-up finishes)
+_STARTUP_TIMINGS: Dict[str, float] = {}
+_FIRST_UPDATE_LOGGED = False
+
+
+def _elapsed_ms(since: float) -> float:
+    return (time.perf_counter() - since) * 1000.0
+
+
+def _get_narrator() -> Optional[ModuleType]:
+    global _NARRATOR_MODULE
+    if not GEMINI_API_KEY:
+        return None
+    if _NARRATOR_MODULE is None:
+        started = time.perf_counter()
+        _NARRATOR_MODULE = importlib.import_module("ai_narrator")
+        _STARTUP_TIMINGS["narrator_import"] = _elapsed_ms(started)
+    return _NARRATOR_MODULE
+
 
 def _ai_rate_limited(chat_id: int) -> float:
     now = asyncio.get_running_loop().time()
@@ -40,9 +80,9 @@ def _mark_ai_call(chat_id: int) -> None:
     _LAST_AI_CALL_AT[chat_id] = asyncio.get_running_loop().time()
 
 
-def _fallback_cataclysm_text() -> str:
+def _fallback_cataclysm_text(pack: Optional[content.ContentPack] = None) -> str:
     # Uses the legacy event list as a simple, offline fallback.
-    event = random_event()
+    event = random_event(events=(pack or content.current_pack()).events)
     return event["text"]
 
 
@@ -59,10 +99,54 @@ async def is_chat_admin(message: Message) -> bool:
     return member.status in (ChatMemberStatus.ADMINISTRATOR, ChatMemberStatus.CREATOR)
 
 
+def _finish_text(game: Game) -> str:
+    text = "<b>🚪 Двері бункера зачиняються…</b>\n\n<b>ВИЖИЛИ:</b>\n"
+    for p in game.alive_players():
+        text += f"• @{p.username} — {p.character.get('profession', 'невідомо')}\n"
+    text += "\nЛюдство отримало шанс. Питання — чи ви ним скористаєтесь."
+    text += f"\n\nСід гри: <code>{game.seed}</code> (повтор: /newgame {game.seed})"
+    return text
+
+
+def _index_user(user_id: int, chat_id: int) -> None:
+    USER_GAMES.setdefault(user_id, set()).add(chat_id)
+
+
+def _unindex_user(user_id: int, chat_id: int) -> None:
+    chats = USER_GAMES.get(user_id)
+    if chats is None:
+        return
+    chats.discard(chat_id)
+    if not chats:
+        del USER_GAMES[user_id]
+
+
+def _unindex_game(game: Game) -> None:
+    for user_id in game.players:
+        _unindex_user(user_id, game.chat_id)
+
+
+def _drop_game(chat_id: int) -> None:
+    game = GAMES.pop(chat_id, None)
+    if game is not None:
+        _unindex_game(game)
+
+
+def _user_games(user_id: int) -> List[Tuple[Game, Player]]:
+    # (game, player) pairs; costs O(games of this user), not O(all games)
+    pairs = []
+    for chat_id in USER_GAMES.get(user_id, ()):
+        game = GAMES.get(chat_id)
+        player = game.players.get(user_id) if game is not None else None
+        if player is not None:
+            pairs.append((game, player))
+    return pairs
+
+
 def get_game(chat_id: int) -> Game:
     game = GAMES.get(chat_id)
     if game is None:
-        game = Game(chat_id=chat_id)
+        game = Game(chat_id=chat_id, unique_professions=UNIQUE_PROFESSIONS)
         GAMES[chat_id] = game
     return game
 
@@ -72,7 +156,10 @@ async def cmd_start(message: Message) -> None:
     if is_private(message):
         await message.answer(
             f"<b>{NARRATOR}:</b> Це приватний канал. Тут ти отримуєш свого персонажа.\n\n"
-            "У групі: /newgame → /join → /startgame → /round"
+            "У групі: /newgame → /join → /startgame → /round\n\n"
+            "Тут:\n"
+            "/me — твої персонажі в поточних іграх\n"
+            "/mygames — стан твоїх ігор"
         )
         return
 
@@ -80,7 +167,7 @@ async def cmd_start(message: Message) -> None:
         f"<b>{NARRATOR}:</b> На Землі — кінець. Є бункер, але місць лише на половину.\n"
         "Гра йде в групі. Персонажі — тільки в приват.\n\n"
         "Команди:\n"
-        "/newgame — створити нову гру (адмін чату)\n"
+        "/newgame [сід] — створити нову гру (адмін чату)\n"
         "/join — приєднатися\n"
         "/startgame — почати гру (адмін)\n"
         "/round — почати раунд і відкрити голосування (адмін)\n"
@@ -100,8 +187,20 @@ async def cmd_newgame(message: Message) -> None:
         await message.answer(f"<b>{NARRATOR}:</b> Тільки адмін чату може створювати гру.")
         return
 
+    # Optional seed to replay a previous game's characters: /newgame <seed>
+    seed = None
+    parts = message.text.split(maxsplit=1)
+    if len(parts) == 2:
+        try:
+            seed = int(parts[1].strip())
+        except ValueError:
+            await message.answer(f"<b>{NARRATOR}:</b> Формат: /newgame [сід]")
+            return
+
     game = get_game(message.chat.id)
-    game.new_game(message.from_user.id)
+    _unindex_game(game)
+    game.new_game(message.from_user.id, seed=seed)
+    game.title = message.chat.title or ""
     await message.answer(
         f"<b>{NARRATOR}:</b> ☢️ Створено гру «Бункер». Напишіть /join.\n"
         "Кожен гравець має відкрити приват із ботом і натиснути Start — інакше персонаж не прийде."
@@ -109,26 +208,27 @@ async def cmd_newgame(message: Message) -> None:
 
     # AI narrator intro (silent fallback to legacy events)
     story: str
-    if not GEMINI_API_KEY:
-        story = _fallback_cataclysm_text()
+    narrator = _get_narrator()
+    if narrator is None:
+        story = _fallback_cataclysm_text(game.pack)
         await message.answer(f"<b>{NARRATOR}:</b>\n{escape(story)}")
         return
 
     if _ai_rate_limited(message.chat.id) > 0:
-        story = _fallback_cataclysm_text()
+        story = _fallback_cataclysm_text(game.pack)
         await message.answer(f"<b>{NARRATOR}:</b>\n{escape(story)}")
         return
 
-    topic = pick_default_cataclysm_topic()
+    topic = narrator.pick_default_cataclysm_topic(topics=game.pack.cataclysm_topics)
     try:
         _mark_ai_call(message.chat.id)
-        story = await generate_cataclysm_story(
+        story = await narrator.generate_cataclysm_story(
             api_key=GEMINI_API_KEY,
             model=GEMINI_MODEL,
             cataclysm_type=topic,
         )
-    except (GeminiQuotaError, Exception):
-        story = _fallback_cataclysm_text()
+    except Exception:  # GeminiQuotaError included
+        story = _fallback_cataclysm_text(game.pack)
     await message.answer(f"<b>{NARRATOR}:</b>\n{escape(story)}")
 
 
@@ -151,18 +251,19 @@ async def cmd_join(message: Message) -> None:
         )
         return
 
-    char = generate_character()
     try:
-        game.join(message.from_user.id, tg_username, char)
+        player = game.join(message.from_user.id, tg_username)
     except RuntimeError as err:
         await message.answer(f"<b>{NARRATOR}:</b> {err}")
         return
+    _index_user(player.user_id, game.chat_id)
+    game.title = message.chat.title or game.title
 
     # Send secret character in private
     try:
         await bot.send_message(
             message.from_user.id,
-            f"<b>{NARRATOR}:</b> 🧬 Твій персонаж:\n\n{format_character(char)}\n\n"
+            f"<b>{NARRATOR}:</b> 🧬 Твій персонаж:\n\n{format_character(player.character)}\n\n"
             "Це таємниця. Не зливай у групу. Працюй словами й фактами.",
         )
         await message.answer(f"<b>{NARRATOR}:</b> @{tg_username} приєднався(лась). Персонаж надісланий у приват.")
@@ -211,12 +312,23 @@ async def cmd_round(message: Message) -> None:
         await message.answer(f"<b>{NARRATOR}:</b> {err}")
         return
 
-    event = random_event()
-    await message.answer(
-        f"<b>{NARRATOR}:</b> 🔔 Раунд {game.round}\n\n"
-        f"{event['text']}\n\n"
-        "🗳️ Голосування відкрито. Команда: /vote @username"
-    )
+    event = random_event(events=game.pack.events)
+    outcome = game.apply_event(event["effect"], auto_eliminate=EVENT_AUTO_ELIMINATE)
+    text = f"<b>{NARRATOR}:</b> 🔔 Раунд {game.round}\n\n{event['text']}\n\n"
+    if outcome.at_risk:
+        text += f"⚠️ Під ударом опинилися гравців: <b>{len(outcome.at_risk)}</b>.\n"
+    if outcome.eliminated is not None:
+        _unindex_user(outcome.eliminated.user_id, game.chat_id)
+        text += f"💀 @{outcome.eliminated.username} не пережив(ла) подію.\n"
+
+    if game.is_finished():
+        await message.answer(text)
+        await message.answer(_finish_text(game))
+        _drop_game(game.chat_id)
+        return
+
+    text += "\n🗳️ Голосування відкрито. Команда: /vote @username"
+    await message.answer(text)
 
 
 @dp.message(Command("cataclysm"))
@@ -229,19 +341,20 @@ async def cmd_cataclysm(message: Message) -> None:
     topic = parts[1].strip()
 
     # Silent fallback to legacy events when Gemini is unavailable/limited.
-    if not GEMINI_API_KEY or _ai_rate_limited(message.chat.id) > 0:
+    narrator = _get_narrator()
+    if narrator is None or _ai_rate_limited(message.chat.id) > 0:
         story = _fallback_cataclysm_text()
         await message.answer(f"<b>{NARRATOR}:</b>\n{escape(story)}")
         return
 
     try:
         _mark_ai_call(message.chat.id)
-        story = await generate_cataclysm_story(
+        story = await narrator.generate_cataclysm_story(
             api_key=GEMINI_API_KEY,
             model=GEMINI_MODEL,
             cataclysm_type=topic,
         )
-    except (GeminiQuotaError, Exception):
+    except Exception:  # GeminiQuotaError included
         story = _fallback_cataclysm_text()
 
     await message.answer(f"<b>{NARRATOR}:</b>\n{escape(story)}")
@@ -289,6 +402,7 @@ async def cmd_endround(message: Message) -> None:
     if eliminated is None:
         await message.answer(f"<b>{NARRATOR}:</b> Немає голосів. Виживання без рішень — теж рішення.")
         return
+    _unindex_user(eliminated.user_id, game.chat_id)
 
     await message.answer(
         f"<b>{NARRATOR}:</b> 💀 @{eliminated.username} вибуває.\n"
@@ -296,13 +410,8 @@ async def cmd_endround(message: Message) -> None:
     )
 
     if game.is_finished():
-        survivors = game.alive_players()
-        text = "<b>🚪 Двері бункера зачиняються…</b>\n\n<b>ВИЖИЛИ:</b>\n"
-        for p in survivors:
-            text += f"• @{p.username} — {p.character.get('profession', 'невідомо')}\n"
-        text += "\nЛюдство отримало шанс. Питання — чи ви ним скористаєтесь."
-        await message.answer(text)
-        GAMES.pop(game.chat_id, None)
+        await message.answer(_finish_text(game))
+        _drop_game(game.chat_id)
 
 
 @dp.message(Command("status"))
@@ -315,6 +424,41 @@ async def cmd_status(message: Message) -> None:
     await message.answer(f"<b>{NARRATOR}:</b>\n{game.status_text()}")
 
 
+@dp.message(Command("me"))
+async def cmd_me(message: Message) -> None:
+    if not is_private(message):
+        await message.answer(f"<b>{NARRATOR}:</b> Персонаж — таємниця. Напиши /me мені в приват.")
+        return
+
+    pairs = _user_games(message.from_user.id)
+    if not pairs:
+        await message.answer(f"<b>{NARRATOR}:</b> Ти не береш участі в жодній грі.")
+        return
+
+    for game, player in pairs:
+        await message.answer(
+            f"<b>{NARRATOR}:</b> 🧬 Твій персонаж у «{escape(game.title or str(game.chat_id))}»:\n\n"
+            f"{format_character(player.character)}"
+        )
+
+
+@dp.message(Command("mygames"))
+async def cmd_mygames(message: Message) -> None:
+    if not is_private(message):
+        await message.answer(f"<b>{NARRATOR}:</b> /mygames працює лише в приваті.")
+        return
+
+    pairs = _user_games(message.from_user.id)
+    if not pairs:
+        await message.answer(f"<b>{NARRATOR}:</b> Ти не береш участі в жодній грі.")
+        return
+
+    text = f"<b>{NARRATOR}:</b> Твої ігри:\n"
+    for game, _ in pairs:
+        text += f"\n<b>{escape(game.title or str(game.chat_id))}</b>\n{game.status_text()}\n"
+    await message.answer(text)
+
+
 @dp.message(Command("endgame"))
 async def cmd_endgame(message: Message) -> None:
     if not is_group(message):
@@ -325,13 +469,80 @@ async def cmd_endgame(message: Message) -> None:
         return
 
     game = get_game(message.chat.id)
+    seed = game.seed
+    _drop_game(message.chat.id)
     game.end_game()
-    GAMES.pop(message.chat.id, None)
-    await message.answer(f"<b>{NARRATOR}:</b> Гру завершено. Щоб почати заново: /newgame")
+    await message.answer(
+        f"<b>{NARRATOR}:</b> Гру завершено. Щоб почати заново: /newgame\n"
+        f"Сід гри: <code>{seed}</code>"
+    )
+
+
+@dp.update.outer_middleware()
+async def _first_update_timer(handler, event, data):
+    global _FIRST_UPDATE_LOGGED
+    if _FIRST_UPDATE_LOGGED:
+        return await handler(event, data)
+
+    _FIRST_UPDATE_LOGGED = True
+    started = time.perf_counter()
+    try:
+        return await handler(event, data)
+    finally:
+        # Handler time plus Telegram-to-done latency; idle time before the first message doesn't count
+        handled_ms = _elapsed_ms(started)
+        sent_at = getattr(event.event, "date", None)
+        if sent_at is not None:
+            latency_s = (datetime.now(timezone.utc) - sent_at).total_seconds()
+            logging.info("First update handled in %.0fms (%.1fs after it was sent)", handled_ms, latency_s)
+        else:
+            logging.info("First update handled in %.0fms", handled_ms)
+
+
+def _log_startup_report() -> None:
+    report = ", ".join(f"{name}={ms:.0f}ms" for name, ms in _STARTUP_TIMINGS.items())
+    logging.info("Startup timings: %s", report)
+
+
+async def _timed(name: str, coro) -> None:
+    started = time.perf_counter()
+    try:
+        await coro
+    except Exception as err:
+        logging.warning("Warm-up step %s failed: %s", name, err)
+    finally:
+        _STARTUP_TIMINGS[name] = _elapsed_ms(started)
+
+
+async def _warm_up() -> None:
+    # Runs next to polling: updates are accepted while the slow parts finish.
+    # There is no persisted game state yet, so there is nothing to restore here.
+    started = time.perf_counter()
+    steps = [_timed("get_me", bot.me())]
+    narrator = _get_narrator()
+    if narrator is not None:
+        steps.append(_timed("gemini_model", narrator.warm_up(api_key=GEMINI_API_KEY, model=GEMINI_MODEL)))
+    await asyncio.gather(*steps)
+    _STARTUP_TIMINGS["warm_up"] = _elapsed_ms(started)
+    _log_startup_report()
+
+
+async def _on_shutdown() -> None:
+    if _NARRATOR_MODULE is not None:
+        await _NARRATOR_MODULE.close_session()
 
 
 async def main() -> None:
-    await dp.start_polling(bot)
+    _STARTUP_TIMINGS["imports"] = _elapsed_ms(_PROCESS_T0)
+    started = time.perf_counter()
+    content.configure(CONTENT_PACK)
+    _STARTUP_TIMINGS["content_pack"] = _elapsed_ms(started)
+    dp.shutdown.register(_on_shutdown)
+    warm_up = asyncio.create_task(_warm_up())
+    try:
+        await dp.start_polling(bot)
+    finally:
+        warm_up.cancel()
 
 
 if __name__ == "__main__":
@@ -1,5 +1,6 @@
 import random
-from typing import Optional
+from array import array
+from typing import Dict, Iterator, Optional, Sequence, Tuple
 
 
 PROFESSIONS = [
@@ -50,16 +51,86 @@ SECRETS = [
 ]
 
 
-def generate_character(rng: Optional[random.Random] = None) -> dict:
-    rng = rng or random
-    return {
-        "profession": rng.choice(PROFESSIONS),
-        "health": rng.choice(HEALTH),
-        "hobby": rng.choice(HOBBIES),
-        "phobia": rng.choice(PHOBIAS),
-        "baggage": rng.choice(BAGGAGE),
-        "secret": rng.choice(SECRETS),
-    }
+Traits = Tuple[Tuple[str, Sequence[str]], ...]
+
+# Dealing order of character fields; each trait is dealt from its own deck.
+# Content packs provide their own pools in the same shape.
+TRAITS: Traits = (
+    ("profession", PROFESSIONS),
+    ("health", HEALTH),
+    ("hobby", HOBBIES),
+    ("phobia", PHOBIAS),
+    ("baggage", BAGGAGE),
+    ("secret", SECRETS),
+)
+
+
+class CharacterDeal:
+    """A batch of dealt characters stored as index columns; dicts are built on access."""
+
+    def __init__(self, columns: Dict[str, array], traits: Traits = TRAITS) -> None:
+        self._columns = columns
+        self._traits = traits
+        self._size = len(columns[traits[0][0]])
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index: int) -> dict:
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError(index)
+        return {trait: pool[self._columns[trait][index]] for trait, pool in self._traits}
+
+    def __iter__(self) -> Iterator[dict]:
+        for i in range(self._size):
+            yield self[i]
+
+
+class CharacterDealer:
+    """Deals characters like cards: a trait value repeats only after its whole deck is used.
+
+    Each deck refill is shuffled by an RNG derived from (seed, trait, refill number),
+    so the k-th dealt character depends only on (seed, k), not on how the deals
+    were batched. No RNG state is kept between refills, which keeps idle games small.
+    """
+
+    def __init__(
+        self,
+        seed: Optional[int] = None,
+        *,
+        traits: Traits = TRAITS,
+        unique_professions: bool = False,
+    ) -> None:
+        self.seed = seed
+        self.traits = traits
+        self.unique_professions = unique_professions
+        self.dealt = 0
+        self._refills = {trait: 0 for trait, _ in traits}
+        self._decks = {trait: array("H") for trait, _ in traits}
+
+    def _draw(self, trait: str, pool_size: int, count: int) -> array:
+        deck = self._decks[trait]
+        while len(deck) < count:
+            n = self._refills[trait]
+            self._refills[trait] = n + 1
+            rng = random.Random(f"{self.seed}:{trait}:{n}") if self.seed is not None else random
+            refill = list(range(pool_size))
+            rng.shuffle(refill)
+            deck.extend(refill)
+        taken = deck[:count]
+        del deck[:count]
+        return taken
+
+    def deal(self, count: int) -> CharacterDeal:
+        if count < 0:
+            raise ValueError("count must be non-negative")
+        if self.unique_professions and self.dealt + count > len(dict(self.traits)["profession"]):
+            raise RuntimeError("Унікальних професій більше немає — лобі заповнене")
+        columns = {trait: self._draw(trait, len(pool), count) for trait, pool in self.traits}
+        self.dealt += count
+        return CharacterDeal(columns, self.traits)
 
 
 def format_character(char: dict) -> str:
@@ -11,5 +11,14 @@ if not BOT_TOKEN:
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-1.5-flash-latest")
 
+# Optional: deal every player in a lobby a different profession (caps the lobby size)
+UNIQUE_PROFESSIONS = os.getenv("UNIQUE_PROFESSIONS", "0") == "1"
+
+# Optional: the most vulnerable player dies when a round event hits them hard enough
+EVENT_AUTO_ELIMINATE = os.getenv("EVENT_AUTO_ELIMINATE", "0") == "1"
+
+# Optional: JSON content pack (characters, events, cataclysm topics); hot-reloaded on change
+CONTENT_PACK = os.getenv("CONTENT_PACK")
+
 NARRATOR = "Ведучий бункера"
 
@@ -0,0 +1,204 @@
+import hashlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+from characters import TRAITS, Traits
+from events import CATACLYSM_TOPICS, EFFECT_WEIGHTS, EVENTS, EffectTable, build_effect_tables
+
+logger = logging.getLogger(__name__)
+
+# Pack file keys for the character pools, in TRAITS order
+TRAIT_SECTIONS = (
+    ("profession", "professions"),
+    ("health", "health"),
+    ("hobby", "hobbies"),
+    ("phobia", "phobias"),
+    ("baggage", "baggage"),
+    ("secret", "secrets"),
+)
+
+# How often current_pack() looks at the source file for changes
+_RELOAD_CHECK_S: float = 5.0
+
+
+@dataclass(frozen=True)
+class ContentPack:
+    version: str
+    traits: Traits
+    events: Tuple[dict, ...]
+    cataclysm_topics: Tuple[str, ...]
+    effect_weights: Dict[str, Dict[str, Dict[str, int]]] = field(repr=False)
+    effect_tables: Dict[str, EffectTable] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "effect_tables", build_effect_tables(self.effect_weights, self.traits))
+
+
+def _builtin_pack() -> ContentPack:
+    return ContentPack(
+        version="builtin",
+        traits=tuple((trait, tuple(pool)) for trait, pool in TRAITS),
+        events=tuple(dict(e) for e in EVENTS),
+        cataclysm_topics=tuple(CATACLYSM_TOPICS),
+        effect_weights=EFFECT_WEIGHTS,
+    )
+
+
+BUILTIN_PACK = _builtin_pack()
+
+
+def _str_list(data: dict, key: str) -> Optional[Tuple[str, ...]]:
+    values = data.get(key)
+    if values is None or values == []:
+        return None
+    if not isinstance(values, list) or not all(isinstance(v, str) and v for v in values):
+        raise ValueError(f"{key!r} must be a list of non-empty strings")
+    if len(values) > 0xFFFF:
+        raise ValueError(f"{key!r} has more than {0xFFFF} entries")
+    # Interned: every game and character refers to the same str objects
+    return tuple(sys.intern(v) for v in values)
+
+
+def _events(data: dict) -> Optional[Tuple[dict, ...]]:
+    events = data.get("events")
+    if events is None or events == []:
+        return None
+    if not isinstance(events, list):
+        raise ValueError("'events' must be a list")
+    out = []
+    for e in events:
+        if not isinstance(e, dict) or not isinstance(e.get("text"), str) or not e["text"]:
+            raise ValueError("every event must be an object with a non-empty 'text'")
+        effect = e.get("effect", "")
+        if not isinstance(effect, str):
+            raise ValueError("event 'effect' must be a string")
+        out.append({"text": sys.intern(e["text"]), "effect": sys.intern(effect)})
+    return tuple(out)
+
+
+def _weights(data: dict) -> Optional[Dict[str, Dict[str, Dict[str, int]]]]:
+    weights = data.get("effect_weights")
+    if weights is None:
+        return None
+    ok = isinstance(weights, dict) and all(
+        isinstance(by_trait, dict)
+        and all(
+            isinstance(by_value, dict)
+            and all(
+                isinstance(w, int) and not isinstance(w, bool) and -(2**31) <= w < 2**31
+                for w in by_value.values()
+            )
+            for by_value in by_trait.values()
+        )
+        for by_trait in weights.values()
+    )
+    if not ok:
+        raise ValueError("'effect_weights' must map effect -> trait -> value -> integer weight")
+    return weights
+
+
+def _pack_from_source(raw: bytes) -> ContentPack:
+    # Anything malformed raises ValueError; sections missing from the source
+    # fall back to the built-in content
+    data = json.loads(raw.decode("utf-8"))
+    if not isinstance(data, dict):
+        raise ValueError("a content pack must be a JSON object")
+
+    builtin_pools = dict(BUILTIN_PACK.traits)
+    traits = tuple((trait, _str_list(data, key) or builtin_pools[trait]) for trait, key in TRAIT_SECTIONS)
+    events = _events(data) or BUILTIN_PACK.events
+    topics = _str_list(data, "cataclysm_topics") or BUILTIN_PACK.cataclysm_topics
+
+    weights = _weights(data)
+    if weights is None:
+        # Keep the built-in weights for values the pack still has
+        pools = dict(traits)
+        weights = {
+            effect: {
+                trait: {value: w for value, w in by_value.items() if value in pools[trait]}
+                for trait, by_value in by_trait.items()
+            }
+            for effect, by_trait in EFFECT_WEIGHTS.items()
+        }
+
+    version = data.get("version") or hashlib.sha1(raw).hexdigest()[:12]
+    return ContentPack(
+        version=str(version),
+        traits=traits,
+        events=events,
+        cataclysm_topics=topics,
+        effect_weights=weights,
+    )
+
+
+def load_pack_source(source: str) -> ContentPack:
+    """Read and validate the JSON pack at `source`; raises OSError or ValueError."""
+    with open(source, "rb") as f:
+        return _pack_from_source(f.read())
+
+
+_LOCK = threading.Lock()
+_SOURCE: Optional[str] = None
+_SOURCE_MTIME: Optional[float] = None
+_CURRENT: ContentPack = BUILTIN_PACK
+_NEXT_CHECK_AT: float = 0.0
+
+
+def configure(source: Optional[str]) -> ContentPack:
+    """Use the JSON pack at `source` (None: built-in content) and load it now."""
+    global _SOURCE, _SOURCE_MTIME, _CURRENT, _NEXT_CHECK_AT
+    with _LOCK:
+        _SOURCE = source
+        _SOURCE_MTIME = None
+        _CURRENT = BUILTIN_PACK
+        _NEXT_CHECK_AT = 0.0
+    return current_pack()
+
+
+def reload_pack(force: bool = False) -> ContentPack:
+    global _SOURCE_MTIME, _CURRENT
+    with _LOCK:
+        if _SOURCE is None:
+            return _CURRENT
+        try:
+            mtime = os.stat(_SOURCE).st_mtime
+        except OSError as err:
+            logger.warning("Content pack %s not found, keeping version %s: %s", _SOURCE, _CURRENT.version, err)
+            return _CURRENT
+        if not force and mtime == _SOURCE_MTIME:
+            return _CURRENT
+        # Remember the mtime even on failure so a broken file is reported once, not every check
+        _SOURCE_MTIME = mtime
+        try:
+            pack = load_pack_source(_SOURCE)
+        except (OSError, ValueError) as err:
+            logger.warning("Content pack %s not loaded, keeping version %s: %s", _SOURCE, _CURRENT.version, err)
+            return _CURRENT
+        # Running games keep the pack object they started with
+        _CURRENT = pack
+        logger.info("Content pack %s loaded (version %s)", _SOURCE, pack.version)
+        return _CURRENT
+
+
+def current_pack() -> ContentPack:
+    global _NEXT_CHECK_AT
+    if _SOURCE is not None:
+        now = time.monotonic()
+        if now >= _NEXT_CHECK_AT:
+            _NEXT_CHECK_AT = now + _RELOAD_CHECK_S
+            return reload_pack()
+    return _CURRENT
+
+
+if __name__ == "__main__":
+    # Validate packs before deploying them: python content.py pack.json ...
+    for source_path in sys.argv[1:]:
+        loaded = load_pack_source(source_path)
+        sizes = ", ".join(f"{trait}={len(pool)}" for trait, pool in loaded.traits)
+        print(f"{source_path}: version {loaded.version}, {sizes}, events={len(loaded.events)}")
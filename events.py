@@ -1,5 +1,7 @@
 import random
-from typing import Optional
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from characters import TRAITS, Traits
 
 
 EVENTS = [
@@ -18,6 +20,81 @@ EVENTS = [
 ]
 
 
-def random_event(rng: Optional[random.Random] = None) -> dict:
+# Seed topics for AI cataclysm intros
+CATACLYSM_TOPICS = [
+    "глобальна біоепідемія зі зривом систем охорони здоровʼя",
+    "обмежений ядерний обмін із подальшою ядерною зимою",
+    "каскадні відмови енергосистем і тривала техногенна криза",
+    "різка зміна клімату з колапсом аграрного виробництва",
+    "масштабна хімічна аварія з отруєнням води та ґрунтів",
+]
+
+
+def random_event(rng: Optional[random.Random] = None, events: Optional[Sequence[dict]] = None) -> dict:
     rng = rng or random
-    return rng.choice(EVENTS)
+    return rng.choice(events or EVENTS)
+
+
+# How each trait value fares against an event effect; unlisted values score 0.
+EFFECT_WEIGHTS: Dict[str, Dict[str, Dict[str, int]]] = {
+    "fire": {
+        "profession": {"Інженер": 2, "Військовий": 1, "Механік": 1},
+        "health": {"Астма": -3, "Хронічна хвороба": -1, "Свіжа травма": -1},
+        "hobby": {"Виживання": 2, "Ремонт": 1},
+        "phobia": {"Клаустрофобія": -1, "Паніка в натовпі": -2},
+        "baggage": {"Фільтр для води": 1, "Аптечка": 1, "Інструменти": 1},
+        "secret": {"Незламна психіка": 1},
+    },
+    "disease": {
+        "profession": {"Лікар": 3, "Психолог": 1},
+        "health": {"Здоровий": 1, "Хронічна хвороба": -2, "Астма": -1, "Свіжа травма": -1},
+        "hobby": {"Медицина": 2},
+        "baggage": {"Аптечка": 2, "Фільтр для води": 1},
+        "secret": {"Прихована хвороба": -3, "Геній": 1},
+    },
+    "sabotage": {
+        "profession": {"Інженер": 2, "Механік": 2, "Військовий": 1},
+        "hobby": {"Ремонт": 2, "Радіозв'язок": 1},
+        "phobia": {"Паніка в натовпі": -1},
+        "baggage": {"Інструменти": 2, "Рація": 1},
+        "secret": {"Схильний до саботажу": -3, "Геній": 1},
+    },
+}
+
+# Players scoring at or below this are "under fire" when the event hits
+EVENT_DANGER_SCORE = -2
+
+EffectTable = Tuple[Tuple[str, Dict[str, int]], ...]
+
+
+def build_effect_tables(
+    weights: Dict[str, Dict[str, Dict[str, int]]],
+    traits: Traits = TRAITS,
+) -> Dict[str, EffectTable]:
+    # Every trait value gets an entry (0 by default), so scoring is a plain dict lookup.
+    tables: Dict[str, EffectTable] = {}
+    for effect, by_trait in weights.items():
+        table = []
+        for trait, pool in traits:
+            trait_weights = by_trait.get(trait, {})
+            unknown = set(trait_weights) - set(pool)
+            if unknown:
+                raise ValueError(f"Unknown {trait} values in {effect!r} weights: {sorted(unknown)}")
+            if trait_weights:
+                table.append((trait, {value: trait_weights.get(value, 0) for value in pool}))
+        tables[effect] = tuple(table)
+    return tables
+
+
+EFFECT_TABLES: Dict[str, EffectTable] = build_effect_tables(EFFECT_WEIGHTS)
+
+
+def score_characters(
+    characters: Sequence[dict],
+    effect: str,
+    tables: Optional[Dict[str, EffectTable]] = None,
+) -> List[int]:
+    table = (EFFECT_TABLES if tables is None else tables).get(effect)
+    if not table:
+        return [0] * len(characters)
+    return [sum(w.get(char.get(trait), 0) for trait, w in table) for char in characters]
@@ -1,10 +1,19 @@
 from __future__ import annotations
 
 import math
+import random
 from collections import defaultdict
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional
 
+from characters import CharacterDeal, CharacterDealer
+from content import ContentPack, current_pack
+from events import EVENT_DANGER_SCORE, score_characters
+
+
+# Characters dealt per batch for a lobby; larger lobbies get further blocks
+LOBBY_DEAL_BLOCK = 16
+
 
 @dataclass
 class Player:
@@ -14,6 +23,13 @@ class Player:
     character: dict = field(default_factory=dict)
 
 
+@dataclass
+class EventOutcome:
+    scores: Dict[int, int]  # user_id -> score against the event
+    at_risk: List[Player]
+    eliminated: Optional[Player] = None
+
+
 @dataclass
 class Game:
     chat_id: int
@@ -29,6 +45,49 @@ class Game:
     started: bool = False
     phase: str = "lobby"  # lobby|voting
     admin_id: Optional[int] = None
+    title: str = ""  # chat title, for DM listings
+
+    # Content pack the game started with; hot reloads only affect new games
+    pack: ContentPack = field(default_factory=current_pack, repr=False)
+
+    # Characters are dealt from a seeded deck, so a game can be replayed from its seed
+    seed: Optional[int] = None
+    unique_professions: bool = False
+    dealer: CharacterDealer = field(init=False, repr=False)
+
+    # Lobby block dealt in one batch; join takes the next row
+    _lobby: Optional[CharacterDeal] = field(default=None, init=False, repr=False)
+    _lobby_next: int = field(default=0, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._reset_dealer(self.seed)
+
+    def _reset_dealer(self, seed: Optional[int]) -> None:
+        self.seed = seed if seed is not None else random.getrandbits(32)
+        self.dealer = CharacterDealer(
+            self.seed,
+            traits=self.pack.traits,
+            unique_professions=self.unique_professions,
+        )
+        self._lobby = None
+        self._lobby_next = 0
+
+    def _deal_lobby_block(self) -> None:
+        if self.unique_professions:
+            # Everything that is left; an empty pool makes deal() raise the "lobby full" error
+            size = max(1, len(dict(self.pack.traits)["profession"]) - self.dealer.dealt)
+        else:
+            size = LOBBY_DEAL_BLOCK
+        self._lobby = self.dealer.deal(size)
+        self._lobby_next = 0
+
+    def _next_character(self) -> dict:
+        if self._lobby is None or self._lobby_next >= len(self._lobby):
+            self._deal_lobby_block()
+        # Only the rows of players who actually join become dicts
+        character = self._lobby[self._lobby_next]
+        self._lobby_next += 1
+        return character
 
     def bunker_capacity(self) -> int:
         return math.ceil(len(self.players) / 2)
@@ -36,7 +95,7 @@ class Game:
     def alive_players(self) -> List[Player]:
         return [p for p in self.players.values() if p.alive]
 
-    def new_game(self, requested_by: int) -> None:
+    def new_game(self, requested_by: int, seed: Optional[int] = None) -> None:
         self.players.clear()
         self.votes.clear()
         self.voter_map.clear()
@@ -44,6 +103,9 @@ class Game:
         self.started = False
         self.phase = "lobby"
         self.admin_id = requested_by
+        self.pack = current_pack()
+        self._reset_dealer(seed)
+        self._deal_lobby_block()
 
     def end_game(self) -> None:
         self.players.clear()
@@ -54,11 +116,13 @@ class Game:
         self.phase = "lobby"
         self.admin_id = None
 
-    def join(self, user_id: int, username: str, character: dict) -> Player:
+    def join(self, user_id: int, username: str, character: Optional[dict] = None) -> Player:
         if self.started:
             raise RuntimeError("Гра вже стартувала — набір закритий")
         if user_id in self.players:
             return self.players[user_id]
+        if character is None:
+            character = self._next_character()
         player = Player(user_id=user_id, username=username, alive=True, character=character)
         self.players[user_id] = player
         return player
@@ -115,6 +179,22 @@ class Game:
         self.votes[target_id] += 1
         return True
 
+    def apply_event(self, effect: str, auto_eliminate: bool = False) -> EventOutcome:
+        alive = self.alive_players()
+        scores = score_characters([p.character for p in alive], effect, self.pack.effect_tables)
+        at_risk = [p for p, score in zip(alive, scores) if score <= EVENT_DANGER_SCORE]
+        outcome = EventOutcome(
+            scores={p.user_id: score for p, score in zip(alive, scores)},
+            at_risk=at_risk,
+        )
+
+        if auto_eliminate and at_risk and len(alive) > self.bunker_capacity():
+            # Lowest score dies; ties go to the smallest id, as in eliminate_player
+            victim = min(at_risk, key=lambda p: (outcome.scores[p.user_id], p.user_id))
+            victim.alive = False
+            outcome.eliminated = victim
+        return outcome
+
     def eliminate_player(self) -> Optional[Player]:
         if not self.votes:
             return None
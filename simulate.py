@@ -0,0 +1,329 @@
+"""Headless Bunker games for balance statistics.
+
+    python simulate.py --games 1000000 --players 8 --strategy mixed --out sim.bin
+
+Games run on the real Game class in a process pool. Workers return finished
+batches as columns plus partial aggregates; the parent merges the aggregates
+and streams the columns to disk, so memory stays flat however many games run.
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import struct
+import sys
+import tempfile
+import time
+from array import array
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import content
+from events import random_event
+from game import Game
+
+STRATEGIES = ("random", "event", "mixed")
+
+# Safety net for strategies that never converge
+MAX_ROUNDS = 100
+
+_MAGIC = b"BNKS"
+
+# Results file columns: name -> array typecode
+GAME_COLUMNS = (("seed", "Q"), ("rounds", "H"), ("ties", "H"), ("event_deaths", "H"))
+PLAYER_COLUMNS = (("game", "I"),) + tuple((trait, "H") for trait, _ in content.TRAIT_SECTIONS) + (("survived", "B"),)
+
+
+@dataclass
+class SimConfig:
+    players: int
+    strategy: str
+    auto_eliminate: bool
+
+
+@dataclass
+class BatchResult:
+    games: int = 0
+    rounds: Counter = field(default_factory=Counter)  # rounds per game -> games
+    voting_rounds: int = 0
+    ties: int = 0
+    event_deaths: int = 0
+    # trait -> [dealt per value index], [survived per value index]
+    dealt: Dict[str, List[int]] = field(default_factory=dict)
+    survived: Dict[str, List[int]] = field(default_factory=dict)
+    columns: Dict[str, bytes] = field(default_factory=dict)
+
+    def merge(self, other: "BatchResult") -> None:
+        self.games += other.games
+        self.rounds.update(other.rounds)
+        self.voting_rounds += other.voting_rounds
+        self.ties += other.ties
+        self.event_deaths += other.event_deaths
+        for trait, counts in other.dealt.items():
+            mine = self.dealt.setdefault(trait, [0] * len(counts))
+            alive = self.survived.setdefault(trait, [0] * len(counts))
+            for i, n in enumerate(counts):
+                mine[i] += n
+                alive[i] += other.survived[trait][i]
+
+
+def _pick_target(rng: random.Random, strategy: str, voter_id: int, alive_ids: List[int], scores: Dict[int, int]) -> int:
+    others = [uid for uid in alive_ids if uid != voter_id]
+    if strategy == "mixed":
+        strategy = rng.choice(("random", "event"))
+    if strategy == "event":
+        # Vote out whoever the current event hurts most
+        worst = min(scores.get(uid, 0) for uid in others)
+        others = [uid for uid in others if scores.get(uid, 0) == worst]
+    return rng.choice(others)
+
+
+def play_game(seed: int, cfg: SimConfig, pack: content.ContentPack) -> Tuple[Game, int, int, int]:
+    """Play one scripted game; returns (game, voting rounds, ties, event deaths)."""
+    rng = random.Random(seed)
+    game = Game(chat_id=seed, seed=seed, pack=pack)
+    deal = game.dealer.deal(cfg.players)
+    for uid in range(cfg.players):
+        game.join(uid, f"p{uid}", deal[uid])
+    game.start_game(0)
+
+    voting_rounds = 0
+    ties = 0
+    event_deaths = 0
+    while not game.is_finished() and game.round < MAX_ROUNDS:
+        game.start_round(0)
+        event = random_event(rng, game.pack.events)
+        outcome = game.apply_event(event["effect"], auto_eliminate=cfg.auto_eliminate)
+        if outcome.eliminated is not None:
+            event_deaths += 1
+            if game.is_finished():
+                break
+
+        alive_ids = [p.user_id for p in game.alive_players()]
+        for voter_id in alive_ids:
+            target = _pick_target(rng, cfg.strategy, voter_id, alive_ids, outcome.scores)
+            game.vote(voter_id, f"p{target}")
+
+        voting_rounds += 1
+        top = max(game.votes.values())
+        if sum(1 for n in game.votes.values() if n == top) > 1:
+            ties += 1
+        game.eliminate_player()
+
+    return game, voting_rounds, ties, event_deaths
+
+
+def run_batch(first_seed: int, count: int, cfg: SimConfig, pack: content.ContentPack) -> BatchResult:
+    value_index = {trait: {v: i for i, v in enumerate(pool)} for trait, pool in pack.traits}
+
+    result = BatchResult(games=count)
+    result.dealt = {trait: [0] * len(pool) for trait, pool in pack.traits}
+    result.survived = {trait: [0] * len(pool) for trait, pool in pack.traits}
+    cols = {name: array(code) for name, code in GAME_COLUMNS + PLAYER_COLUMNS}
+
+    for seed in range(first_seed, first_seed + count):
+        game, voting_rounds, ties, event_deaths = play_game(seed, cfg, pack)
+        rounds = game.round
+        result.rounds[rounds] += 1
+        result.voting_rounds += voting_rounds
+        result.ties += ties
+        result.event_deaths += event_deaths
+        cols["seed"].append(seed)
+        cols["rounds"].append(rounds)
+        cols["ties"].append(ties)
+        cols["event_deaths"].append(event_deaths)
+
+        for player in game.players.values():
+            cols["game"].append(seed - first_seed)
+            cols["survived"].append(player.alive)
+            for trait, _ in pack.traits:
+                idx = value_index[trait][player.character[trait]]
+                cols[trait].append(idx)
+                result.dealt[trait][idx] += 1
+                if player.alive:
+                    result.survived[trait][idx] += 1
+
+    # Player rows carry a batch-local game index; the parent rebases it
+    result.columns = {name: col.tobytes() for name, col in cols.items()}
+    return result
+
+
+# The run's content pack, pinned per worker; never hot-reloaded mid-run
+_WORKER_PACK: Optional[content.ContentPack] = None
+
+
+def _init_worker(pack: content.ContentPack) -> None:
+    global _WORKER_PACK
+    _WORKER_PACK = pack
+
+
+def _run_worker_batch(first_seed: int, count: int, cfg: SimConfig) -> BatchResult:
+    return run_batch(first_seed, count, cfg, _WORKER_PACK)
+
+
+class ColumnWriter:
+    """Appends column chunks to spill files, then packs them into one file."""
+
+    def __init__(self) -> None:
+        self._dir = tempfile.mkdtemp(prefix="bunker-sim-")
+        self._files = {name: open(os.path.join(self._dir, name), "wb") for name, _ in GAME_COLUMNS + PLAYER_COLUMNS}
+        self.games = 0
+        self.rows = 0
+
+    def append(self, batch: BatchResult) -> None:
+        game_ids = array("I")
+        game_ids.frombytes(batch.columns["game"])
+        self._files["game"].write(array("I", (self.games + i for i in game_ids)).tobytes())
+        for name, data in batch.columns.items():
+            if name != "game":
+                self._files[name].write(data)
+        self.games += batch.games
+        self.rows += len(game_ids)
+
+    def discard(self) -> None:
+        for f in self._files.values():
+            f.close()
+        shutil.rmtree(self._dir, ignore_errors=True)
+
+    def finish(self, path: str, meta: dict) -> None:
+        try:
+            self._pack(path, meta)
+        finally:
+            self.discard()
+
+    def _pack(self, path: str, meta: dict) -> None:
+        for f in self._files.values():
+            f.close()
+        columns = []
+        for name, code in GAME_COLUMNS + PLAYER_COLUMNS:
+            size = os.path.getsize(os.path.join(self._dir, name))
+            columns.append({"name": name, "type": code, "bytes": size})
+        header = json.dumps({**meta, "byteorder": sys.byteorder, "columns": columns}, ensure_ascii=False).encode("utf-8")
+        with open(path, "wb") as out:
+            out.write(_MAGIC)
+            out.write(struct.pack("<I", len(header)))
+            out.write(header)
+            for name, _ in GAME_COLUMNS + PLAYER_COLUMNS:
+                with open(os.path.join(self._dir, name), "rb") as f:
+                    shutil.copyfileobj(f, out)
+
+
+def read_results(path: str) -> Tuple[dict, Dict[str, array]]:
+    with open(path, "rb") as f:
+        if f.read(4) != _MAGIC:
+            raise ValueError(f"{path} is not a simulation results file")
+        (size,) = struct.unpack("<I", f.read(4))
+        meta = json.loads(f.read(size).decode("utf-8"))
+        cols = {}
+        for col in meta["columns"]:
+            data = array(col["type"])
+            data.frombytes(f.read(col["bytes"]))
+            if meta["byteorder"] != sys.byteorder:
+                data.byteswap()
+            cols[col["name"]] = data
+    return meta, cols
+
+
+def format_report(total: BatchResult, pack: content.ContentPack) -> str:
+    lines = [f"Games: {total.games}"]
+    if total.games:
+        mean = sum(r * n for r, n in total.rounds.items()) / total.games
+        lines.append(f"Rounds: mean {mean:.2f}, histogram {dict(sorted(total.rounds.items()))}")
+        if total.voting_rounds:
+            lines.append(f"Vote ties: {total.ties / total.voting_rounds:.1%} of voting rounds")
+        lines.append(f"Event deaths per game: {total.event_deaths / total.games:.3f}")
+    for trait, pool in pack.traits:
+        lines.append(f"\n{trait}:")
+        rates = []
+        for i, value in enumerate(pool):
+            dealt = total.dealt.get(trait, [0] * len(pool))[i]
+            alive = total.survived.get(trait, [0] * len(pool))[i]
+            rates.append((alive / dealt if dealt else 0.0, value, dealt))
+        for rate, value, dealt in sorted(rates, reverse=True):
+            lines.append(f"  {rate:6.1%}  {value} (n={dealt})")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run headless Bunker games for balance statistics")
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--players", type=int, default=8)
+    parser.add_argument("--strategy", choices=STRATEGIES, default="mixed")
+    parser.add_argument("--auto-eliminate", action="store_true", help="let round events eliminate players")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game; games use consecutive seeds")
+    parser.add_argument("--batch", type=int, default=500, help="games per worker task")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--pack", default=os.getenv("CONTENT_PACK"), help="JSON content pack (default: built-in)")
+    parser.add_argument("--out", default="sim_results.bin", help="columnar results file")
+    args = parser.parse_args(argv)
+
+    if args.players < 2:
+        parser.error("--players must be at least 2")
+    if args.games < 1:
+        parser.error("--games must be at least 1")
+    if args.seed < 0 or args.seed + args.games > 2**64:
+        parser.error("--seed must be non-negative and seeds must fit in 64 bits")
+    if args.batch < 1:
+        parser.error("--batch must be at least 1")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    # One pack for the whole run: workers get this object, so column indices,
+    # merged counts and the header all refer to the same pools
+    pack = content.load_pack_source(args.pack) if args.pack else content.BUILTIN_PACK
+    cfg = SimConfig(players=args.players, strategy=args.strategy, auto_eliminate=args.auto_eliminate)
+    total = BatchResult()
+    writer = ColumnWriter()
+    started = time.perf_counter()
+
+    batches = [
+        (first, min(args.batch, args.seed + args.games - first))
+        for first in range(args.seed, args.seed + args.games, args.batch)
+    ]
+    # Keep a bounded number of batches in flight so results stream instead of piling up
+    max_in_flight = args.workers * 4
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker, initargs=(pack,)) as pool:
+            pending = set()
+            for first, count in batches:
+                pending.add(pool.submit(_run_worker_batch, first, count, cfg))
+                if len(pending) < max_in_flight:
+                    continue
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    batch = fut.result()
+                    total.merge(batch)
+                    writer.append(batch)
+            for fut in pending:
+                batch = fut.result()
+                total.merge(batch)
+                writer.append(batch)
+    except BaseException:
+        # Don't leave spill files behind when a worker fails or the run is interrupted
+        writer.discard()
+        raise
+
+    elapsed = time.perf_counter() - started
+    writer.finish(
+        args.out,
+        {
+            "pack": pack.version,
+            "players": args.players,
+            "strategy": args.strategy,
+            "auto_eliminate": args.auto_eliminate,
+            "games": writer.games,
+            "rows": writer.rows,
+            "traits": {trait: list(pool) for trait, pool in pack.traits},
+        },
+    )
+    print(format_report(total, pack))
+    print(f"\n{total.games} games in {elapsed:.1f}s ({total.games / max(elapsed, 1e-9):.0f} games/s), results: {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())